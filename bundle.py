@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Booksy Bundle - Portable backup and transfer format
+Packs one or more books into a compressed .booksy file and unpacks them again
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+BUNDLE_FORMAT = 'booksy-bundle'
+BUNDLE_VERSION = 1
+BUNDLE_EXTENSION = '.booksy'
+MANIFEST_NAME = 'manifest.json'
+CHUNK_SIZE = 64 * 1024
+
+# Book fields stored in the manifest; section text lives in separate entries
+BOOK_FIELDS = ('id', 'title', 'author', 'format', 'created_at', 'updated_at')
+
+
+class BundleError(Exception):
+    """Raised when a bundle is malformed, corrupt or missing requested books"""
+
+
+def pack_books(books, path):
+    """Write books to a bundle, one compressed entry per section.
+
+    Sections are written as they are visited and the manifest goes last, so
+    only one section is ever held in encoded form. The bundle is built in a
+    temporary file next to path and only moved into place once complete, so
+    a failed pack never leaves a truncated bundle behind. Returns the manifest.
+    """
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'books': []
+    }
+
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    os.close(fd)
+
+    try:
+        with zipfile.ZipFile(tmp_name, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for book_index, book in enumerate(books):
+                entry = {field: book.get(field) for field in BOOK_FIELDS}
+                entry['sections'] = []
+
+                for section_index, (key, content) in enumerate(book.get('content', {}).items()):
+                    data = (content or '').encode('utf-8')
+                    name = f"books/{book_index:04d}/{section_index:04d}.txt"
+                    zf.writestr(name, data)
+                    entry['sections'].append({
+                        'key': key,
+                        'path': name,
+                        'size': len(data),
+                        'sha256': hashlib.sha256(data).hexdigest()
+                    })
+
+                manifest['books'].append(entry)
+
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return manifest
+
+
+def read_manifest(path):
+    """Return the manifest of a bundle without touching any section entries"""
+    try:
+        with zipfile.ZipFile(path, 'r') as zf:
+            return _load_manifest(zf)
+    except zipfile.BadZipFile:
+        raise BundleError(f"{path} is not a Booksy bundle")
+
+
+def unpack_books(path, book_ids=None):
+    """Yield books from a bundle one at a time, verifying every section.
+
+    When book_ids is given only those books are decompressed; the other
+    entries in the bundle are never read.
+    """
+    try:
+        zf = zipfile.ZipFile(path, 'r')
+    except zipfile.BadZipFile:
+        raise BundleError(f"{path} is not a Booksy bundle")
+
+    with zf:
+        manifest = _load_manifest(zf)
+        entries = manifest['books']
+
+        if book_ids is not None:
+            wanted = set(book_ids)
+            missing = wanted - {entry['id'] for entry in entries}
+            if missing:
+                raise BundleError(f"Books not found in bundle: {', '.join(sorted(missing))}")
+            entries = [entry for entry in entries if entry['id'] in wanted]
+
+        for entry in entries:
+            book = {field: entry[field] for field in BOOK_FIELDS}
+            book['content'] = {}
+            for section in entry['sections']:
+                book['content'][section['key']] = _read_section(zf, section)
+            yield book
+
+
+def _load_manifest(zf):
+    try:
+        manifest = json.loads(zf.read(MANIFEST_NAME).decode('utf-8'))
+    except KeyError:
+        raise BundleError("Bundle has no manifest")
+    except (ValueError, zipfile.BadZipFile) as e:
+        raise BundleError(f"Bundle manifest is unreadable: {e}")
+
+    if not isinstance(manifest, dict) or manifest.get('format') != BUNDLE_FORMAT:
+        raise BundleError("Bundle manifest has an unknown format")
+    if not _is_int(manifest.get('version')):
+        raise BundleError("Bundle manifest has no valid version")
+    if manifest['version'] > BUNDLE_VERSION:
+        raise BundleError(f"Bundle version {manifest['version']} is newer than this Booksy supports")
+    if not isinstance(manifest.get('books'), list):
+        raise BundleError("Bundle manifest has no book list")
+
+    seen_ids = set()
+    for entry in manifest['books']:
+        _check_book_entry(entry)
+        if entry['id'] in seen_ids:
+            raise BundleError(f"Bundle lists book {entry['id']} more than once")
+        seen_ids.add(entry['id'])
+    return manifest
+
+
+def _check_book_entry(entry):
+    """Reject manifest entries that would break the library once imported"""
+    if not isinstance(entry, dict):
+        raise BundleError("Bundle manifest has a malformed book entry")
+    for field in BOOK_FIELDS:
+        if not isinstance(entry.get(field), str):
+            raise BundleError(f"Bundle book entry has no valid '{field}'")
+    if not isinstance(entry.get('sections'), list):
+        raise BundleError(f"Bundle book '{entry['title']}' has no section list")
+
+    for section in entry['sections']:
+        if not (isinstance(section, dict)
+                and isinstance(section.get('key'), str)
+                and isinstance(section.get('path'), str)
+                and _is_int(section.get('size')) and section['size'] >= 0
+                and isinstance(section.get('sha256'), str)):
+            raise BundleError(f"Bundle book '{entry['title']}' has a malformed section entry")
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _read_section(zf, section):
+    """Stream one section entry, checking its size and SHA-256.
+
+    Reading stops as soon as the entry grows past the size recorded in the
+    manifest, so a lying manifest cannot make us inflate more than that.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+
+    try:
+        if zf.getinfo(section['path']).file_size != section['size']:
+            raise BundleError(f"Size mismatch in section '{section['key']}'")
+
+        with zf.open(section['path']) as f:
+            while True:
+                chunk = f.read(min(CHUNK_SIZE, section['size'] - size + 1))
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > section['size']:
+                    raise BundleError(f"Size mismatch in section '{section['key']}'")
+                digest.update(chunk)
+                chunks.append(chunk)
+    except KeyError:
+        raise BundleError(f"Bundle is missing entry {section['path']}")
+    except (zipfile.BadZipFile, OSError) as e:
+        raise BundleError(f"Bundle entry {section['path']} is corrupt: {e}")
+
+    if size != section['size'] or digest.hexdigest() != section['sha256']:
+        raise BundleError(f"Checksum mismatch in section '{section['key']}'")
+    try:
+        return b''.join(chunks).decode('utf-8')
+    except UnicodeDecodeError:
+        raise BundleError(f"Section '{section['key']}' is not valid text")
+
+
+def _load_library(path):
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def main(argv=None):
+    default_library = Path.home() / "Booksy" / "books.json"
+
+    parser = argparse.ArgumentParser(description="Pack and unpack Booksy bundles")
+    parser.add_argument('--library', type=Path, default=default_library,
+                        help=f"books.json to read from or import into (default: {default_library})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack_cmd = commands.add_parser('pack', help="Write books to a bundle")
+    pack_cmd.add_argument('bundle', type=Path)
+    pack_cmd.add_argument('--book', action='append', dest='book_ids', metavar='ID',
+                          help="Book id to include (repeatable, default: all books)")
+
+    list_cmd = commands.add_parser('list', help="Show the books in a bundle")
+    list_cmd.add_argument('bundle', type=Path)
+
+    unpack_cmd = commands.add_parser('unpack', help="Import books from a bundle")
+    unpack_cmd.add_argument('bundle', type=Path)
+    unpack_cmd.add_argument('--book', action='append', dest='book_ids', metavar='ID',
+                            help="Book id to import (repeatable, default: all books)")
+    unpack_cmd.add_argument('--replace', action='store_true',
+                            help="Overwrite books that already exist in the library")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'pack':
+            library = _load_library(args.library)
+            book_ids = list(dict.fromkeys(args.book_ids or library))
+            missing = [book_id for book_id in book_ids if book_id not in library]
+            if missing:
+                raise BundleError(f"Books not found in library: {', '.join(missing)}")
+            manifest = pack_books((library[book_id] for book_id in book_ids), args.bundle)
+            print(f"Packed {len(manifest['books'])} book(s) into {args.bundle}")
+
+        elif args.command == 'list':
+            for entry in read_manifest(args.bundle)['books']:
+                print(f"{entry['id']}  {entry['title']} by {entry['author']} "
+                      f"({len(entry['sections'])} sections)")
+
+        elif args.command == 'unpack':
+            library = _load_library(args.library)
+            imported = skipped = 0
+            for book in unpack_books(args.bundle, args.book_ids):
+                if book['id'] in library and not args.replace:
+                    print(f"Skipping '{book['title']}': already in library (use --replace)")
+                    skipped += 1
+                    continue
+                library[book['id']] = book
+                imported += 1
+
+            if imported:
+                args.library.parent.mkdir(parents=True, exist_ok=True)
+                with open(args.library, 'w', encoding='utf-8') as f:
+                    json.dump(library, f, indent=2, ensure_ascii=False)
+            print(f"Imported {imported} book(s), skipped {skipped}")
+
+    except (BundleError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,7 @@ from datetime import datetime
 import uuid
 import threading
 from pathlib import Path
+from bundle import pack_books, read_manifest, unpack_books, BUNDLE_EXTENSION
 
 class BooksyDesktop:
     def __init__(self):
@@ -64,6 +65,9 @@ class BooksyDesktop:
         
         ttk.Label(header_frame, text="📚 My Books", style='Title.TLabel').pack(side=tk.LEFT)
         ttk.Button(header_frame, text="+ New Book", command=self.show_create_book).pack(side=tk.RIGHT)
+        ttk.Button(header_frame, text="📥 Import Bundle", command=self.import_bundle).pack(side=tk.RIGHT, padx=5)
+        if self.books:
+            ttk.Button(header_frame, text="📦 Backup All", command=lambda: self.export_bundle(list(self.books))).pack(side=tk.RIGHT)
         
         # Books list
         if not self.books:
@@ -124,6 +128,7 @@ class BooksyDesktop:
         
         ttk.Button(btn_frame, text="✏️ Edit", command=lambda: self.edit_book(book_id)).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(btn_frame, text="📄 Export DOCX", command=lambda: self.export_book(book_id, 'docx')).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="📦 Export Bundle", command=lambda: self.export_bundle([book_id])).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="🗑️ Delete", command=lambda: self.delete_book(book_id)).pack(side=tk.RIGHT)
     
     def show_create_book(self):
@@ -586,6 +591,56 @@ class BooksyDesktop:
             except Exception as e:
                 messagebox.showerror("Error", f"Export failed: {str(e)}")
     
+    def export_bundle(self, book_ids):
+        """Pack the given books into a .booksy bundle"""
+        if len(book_ids) == 1:
+            default_name = f"{self.books[book_ids[0]]['title']}{BUNDLE_EXTENSION}"
+        else:
+            default_name = f"Booksy Backup {datetime.now():%Y-%m-%d}{BUNDLE_EXTENSION}"
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=BUNDLE_EXTENSION,
+            filetypes=[("Booksy bundles", f"*{BUNDLE_EXTENSION}")],
+            initialfile=default_name
+        )
+        
+        if filename:
+            try:
+                pack_books((self.books[book_id] for book_id in book_ids), filename)
+                messagebox.showinfo("Success", f"{len(book_ids)} book(s) exported to {filename}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Bundle export failed: {str(e)}")
+    
+    def import_bundle(self):
+        """Import books from a .booksy bundle into the library"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("Booksy bundles", f"*{BUNDLE_EXTENSION}"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        try:
+            entries = read_manifest(filename)['books']
+            existing = [entry for entry in entries if entry['id'] in self.books]
+            replace = bool(existing) and messagebox.askyesno(
+                "Books Already Exist",
+                f"{len(existing)} book(s) in this bundle are already in your library.\n"
+                "Replace them with the bundled copies?"
+            )
+            
+            book_ids = [entry['id'] for entry in entries if replace or entry['id'] not in self.books]
+            imported = {book['id']: book for book in unpack_books(filename, book_ids)}
+        except Exception as e:
+            messagebox.showerror("Error", f"Import failed: {str(e)}")
+            return
+        
+        # Only touch the library once every requested book has been verified
+        self.books.update(imported)
+        if imported:
+            self.save_books()
+        messagebox.showinfo("Success", f"Imported {len(imported)} book(s), skipped {len(entries) - len(book_ids)}")
+        self.show_dashboard()
+    
     def delete_book(self, book_id):
         book = self.books[book_id]
         if messagebox.askyesno("Confirm Delete", f"Delete '{book['title']}'?\nThis cannot be undone."):
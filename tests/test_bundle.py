@@ -0,0 +1,146 @@
+import json
+import zipfile
+
+import pytest
+
+import bundle
+from bundle import BundleError, pack_books, read_manifest, unpack_books
+
+
+def make_book(book_id, title, content):
+    return {
+        'id': book_id,
+        'title': title,
+        'author': 'Ada',
+        'format': 'novel',
+        'created_at': '2026-01-01T00:00:00',
+        'updated_at': '2026-01-02T00:00:00',
+        'content': content
+    }
+
+
+@pytest.fixture
+def books():
+    return [
+        make_book('a', 'First', {'title_page': 'First\n\nby Ada', 'chapter_1': 'héllo ' * 20000}),
+        make_book('b', 'Second', {'empty': '', 'missing': None, 'poem': 'roses'}),
+    ]
+
+
+def rewrite(src, dst, replace=None, manifest=None):
+    """Copy a bundle, swapping in new entry data and/or a new manifest"""
+    replace = replace or {}
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info.filename)
+            if info.filename == bundle.MANIFEST_NAME and manifest is not None:
+                data = json.dumps(manifest).encode('utf-8')
+            zout.writestr(info.filename, replace.get(info.filename, data))
+
+
+def test_round_trip(tmp_path, books):
+    path = tmp_path / 'books.booksy'
+    pack_books(books, path)
+
+    unpacked = list(unpack_books(path))
+
+    assert unpacked[0] == books[0]
+    assert unpacked[1]['content'] == {'empty': '', 'missing': '', 'poem': 'roses'}
+    assert list(unpacked[0]['content']) == ['title_page', 'chapter_1']
+    assert [entry['id'] for entry in read_manifest(path)['books']] == ['a', 'b']
+
+
+def test_tampered_section_is_rejected(tmp_path, books):
+    path = tmp_path / 'books.booksy'
+    manifest = pack_books(books, path)
+    poem = manifest['books'][1]['sections'][2]['path']
+    rewrite(path, tmp_path / 'bad.booksy', replace={poem: b'lilac'})
+
+    with pytest.raises(BundleError, match='Checksum'):
+        list(unpack_books(tmp_path / 'bad.booksy'))
+
+
+def test_understated_section_size_is_rejected_before_reading(tmp_path, books, monkeypatch):
+    path = tmp_path / 'books.booksy'
+    manifest = pack_books(books, path)
+    section = manifest['books'][0]['sections'][1]
+    section['size'] = 5
+    rewrite(path, tmp_path / 'bomb.booksy', manifest=manifest)
+
+    opened = []
+    real_open = zipfile.ZipFile.open
+    def spy(self, name, *args, **kwargs):
+        opened.append(getattr(name, 'filename', name))
+        return real_open(self, name, *args, **kwargs)
+    monkeypatch.setattr(zipfile.ZipFile, 'open', spy)
+
+    with pytest.raises(BundleError, match='Size mismatch'):
+        list(unpack_books(tmp_path / 'bomb.booksy', ['a']))
+    assert section['path'] not in opened
+
+
+def test_selective_unpack_skips_other_books(tmp_path, books, monkeypatch):
+    path = tmp_path / 'books.booksy'
+    pack_books(books, path)
+
+    opened = []
+    real_open = zipfile.ZipFile.open
+    def spy(self, name, *args, **kwargs):
+        opened.append(getattr(name, 'filename', name))
+        return real_open(self, name, *args, **kwargs)
+    monkeypatch.setattr(zipfile.ZipFile, 'open', spy)
+
+    unpacked = list(unpack_books(path, ['b']))
+
+    assert [book['id'] for book in unpacked] == ['b']
+    assert not any(name.startswith('books/0000/') for name in opened)
+
+
+def test_unknown_book_id_is_rejected(tmp_path, books):
+    path = tmp_path / 'books.booksy'
+    pack_books(books, path)
+
+    with pytest.raises(BundleError, match='not found'):
+        list(unpack_books(path, ['zz']))
+
+
+@pytest.mark.parametrize('change', [
+    lambda m: [],
+    lambda m: {k: v for k, v in m.items() if k != 'books'},
+    lambda m: dict(m, version='2'),
+    lambda m: dict(m, version=99),
+    lambda m: dict(m, format='other'),
+    lambda m: dict(m, books=[dict(m['books'][0], updated_at=None)]),
+    lambda m: dict(m, books=[{k: v for k, v in m['books'][0].items() if k != 'format'}]),
+    lambda m: dict(m, books=[dict(m['books'][0], sections=[{'key': 'x', 'path': 'y', 'size': '1', 'sha256': ''}])]),
+    lambda m: dict(m, books=[m['books'][0], m['books'][0]]),
+])
+def test_malformed_manifest_is_rejected(tmp_path, books, change):
+    path = tmp_path / 'books.booksy'
+    manifest = pack_books(books, path)
+    rewrite(path, tmp_path / 'bad.booksy', manifest=change(json.loads(json.dumps(manifest))))
+
+    with pytest.raises(BundleError):
+        list(unpack_books(tmp_path / 'bad.booksy'))
+    assert bundle.main(['list', str(tmp_path / 'bad.booksy')]) == 1
+
+
+def test_failed_pack_leaves_no_file(tmp_path, books):
+    path = tmp_path / 'books.booksy'
+
+    def broken():
+        yield books[0]
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        pack_books(broken(), path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cli_pack_ignores_repeated_ids(tmp_path, books):
+    library = tmp_path / 'books.json'
+    library.write_text(json.dumps({book['id']: book for book in books}), encoding='utf-8')
+    path = tmp_path / 'one.booksy'
+
+    assert bundle.main(['--library', str(library), 'pack', str(path), '--book', 'a', '--book', 'a']) == 0
+    assert [entry['id'] for entry in read_manifest(path)['books']] == ['a']